@@ -3,7 +3,10 @@
 This package contains all the API endpoint modules for the application.
 """
 
-from fastapi import APIRouter
+import httpx
+from fastapi import APIRouter, Depends
+from app.core.http import get_http_client
+from app.services.github_service import GitHubService, get_github_service
 from app.schemas.build import BuildRequest, BuildResponse
 
 # Create the endpoints router
@@ -17,10 +20,14 @@ def register_routers():
     
     # Add a top-level dispatcher endpoint required by the evaluator
     @router.post("/api-endpoint", response_model=BuildResponse, tags=["build"])
-    async def api_endpoint_dispatch(payload: BuildRequest):
+    async def api_endpoint_dispatch(
+        payload: BuildRequest,
+        http: httpx.AsyncClient = Depends(get_http_client),
+        github: GitHubService = Depends(get_github_service),
+    ):
         if payload.round == 1:
-            return await build_endpoints.build_app(payload)
-        return await build_endpoints.update_app(payload)
+            return await build_endpoints.build_app(payload, http, github)
+        return await build_endpoints.update_app(payload, http, github)
     
 
 # Register routers when this module is imported
@@ -1,5 +1,8 @@
 from fastapi import APIRouter, Query, HTTPException
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
+import base64
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -7,28 +10,69 @@ from app.models import Submission, EvaluationResult
 
 router = APIRouter()
 
+
+def _encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode the (created_at, id) keyset position of a row as an opaque token."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a token produced by `_encode_cursor`.
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(model, cursor: str):
+    """Filter selecting rows strictly after `cursor` in (created_at, id) DESC order."""
+    created_at, row_id = _decode_cursor(cursor)
+    return or_(
+        model.created_at < created_at,
+        and_(model.created_at == created_at, model.id < row_id),
+    )
+
+
 @router.get("/submissions")
 def list_submissions(
     email: Optional[str] = None,
     task: Optional[str] = None,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ):
     with get_db() as db:  # type: Session
-        q = db.query(Submission)
+        filters = []
         if email:
-            q = q.filter(Submission.email == email)
+            filters.append(Submission.email == email)
         if task:
-            q = q.filter(Submission.task == task)
-        total = q.count()
+            filters.append(Submission.task == task)
+
+        page_filters = list(filters)
+        if cursor:
+            page_filters.append(_after_cursor(Submission, cursor))
+
+        # Fetch one extra row to learn whether another page exists
         rows = (
-            q.order_by(Submission.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+            db.query(Submission)
+            .filter(*page_filters)
+            .order_by(Submission.created_at.desc(), Submission.id.desc())
+            .limit(limit + 1)
             .all()
         )
-        return {
-            "total": total,
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        result = {
+            "next_cursor": next_cursor,
             "items": [
                 {
                     "id": s.id,
@@ -44,6 +88,11 @@ def list_submissions(
                 for s in rows
             ],
         }
+        if include_total:
+            result["total"] = (
+                db.query(func.count(Submission.id)).filter(*filters).scalar()
+            )
+        return result
 
 @router.get("/evaluations")
 def list_evaluations(
@@ -51,41 +100,70 @@ def list_evaluations(
     task: Optional[str] = None,
     round: Optional[int] = None,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ):
     with get_db() as db:  # type: Session
-        # Join to pull email/task/round
-        from sqlalchemy import select
-        from sqlalchemy.orm import aliased
-
-        q = db.query(EvaluationResult, Submission).join(Submission, EvaluationResult.submission_id == Submission.id)
+        filters = []
         if email:
-            q = q.filter(Submission.email == email)
+            filters.append(Submission.email == email)
         if task:
-            q = q.filter(Submission.task == task)
+            filters.append(Submission.task == task)
         if round is not None:
-            q = q.filter(Submission.round == round)
-        total = q.count()
+            filters.append(Submission.round == round)
+
+        page_filters = list(filters)
+        if cursor:
+            page_filters.append(_after_cursor(EvaluationResult, cursor))
+
+        # Select only the columns the response needs so rows come back as
+        # plain tuples instead of hydrated ORM instances.
         rows = (
-            q.order_by(EvaluationResult.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+            db.query(
+                EvaluationResult.id,
+                Submission.email,
+                Submission.task,
+                Submission.round,
+                EvaluationResult.status,
+                EvaluationResult.score,
+                EvaluationResult.passed,
+                EvaluationResult.feedback,
+                EvaluationResult.created_at,
+            )
+            .join(Submission, EvaluationResult.submission_id == Submission.id)
+            .filter(*page_filters)
+            .order_by(EvaluationResult.created_at.desc(), EvaluationResult.id.desc())
+            .limit(limit + 1)
             .all()
         )
-        return {
-            "total": total,
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        result = {
+            "next_cursor": next_cursor,
             "items": [
                 {
-                    "id": ev.id,
-                    "email": sub.email,
-                    "task": sub.task,
-                    "round": sub.round,
-                    "status": ev.status,
-                    "score": ev.score,
-                    "passed": ev.passed,
-                    "feedback": ev.feedback,
-                    "created_at": ev.created_at.isoformat(),
+                    "id": row.id,
+                    "email": row.email,
+                    "task": row.task,
+                    "round": row.round,
+                    "status": row.status,
+                    "score": row.score,
+                    "passed": row.passed,
+                    "feedback": row.feedback,
+                    "created_at": row.created_at.isoformat(),
                 }
-                for ev, sub in rows
+                for row in rows
             ],
         }
+        if include_total:
+            result["total"] = (
+                db.query(func.count(EvaluationResult.id))
+                .select_from(EvaluationResult)
+                .join(Submission, EvaluationResult.submission_id == Submission.id)
+                .filter(*filters)
+                .scalar()
+            )
+        return result
@@ -1,24 +1,58 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Dict, Any, Optional
 import logging
-import uuid
 from datetime import datetime
 import re
 import asyncio
 import httpx
 
 from app.schemas.build import BuildRequest, BuildResponse
-from app.services.github_service import github_service
+from app.services.github_service import GitHubService, get_github_service
 from app.services.llm_service import llm_service
 from app.services.evaluation_client import evaluation_client
+from app.core.http import get_http_client
 from app.core.security import verify_secret
-from app.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in repository names; each one maps to a single "-"
+# so round 2 resolves the same repository name as round 1.
+_TASK_RE = re.compile(r"[^a-zA-Z0-9_-]")
+
+def _safe_task(task: str) -> str:
+    """Derive the stable repository name for a task."""
+    return _TASK_RE.sub("-", task.strip()).lower()
+
+async def wait_for_pages(client: httpx.AsyncClient, url: str) -> bool:
+    """
+    Check that a GitHub Pages URL serves 200.
+    
+    The shared client's transport keeps retrying *.github.io while the site
+    still answers 404, so a single request covers the whole retry window.
+    
+    Args:
+        client: HTTP client used for the check
+        url: The Pages URL to check
+        
+    Returns:
+        bool: True if the site became available, False otherwise
+    """
+    try:
+        resp = await client.get(url, headers={"Cache-Control": "no-cache"})
+    except httpx.HTTPError as e:
+        logger.warning(f"Pages check error for {url}: {e}")
+        return False
+    if resp.status_code != 200:
+        logger.warning(f"GitHub Pages did not return 200 within retry window ({resp.status_code}): {url}")
+        return False
+    return True
+
 @router.post("", response_model=BuildResponse)
-async def build_app(request: BuildRequest):
+async def build_app(
+    request: BuildRequest,
+    http: httpx.AsyncClient = Depends(get_http_client),
+    github: GitHubService = Depends(get_github_service),
+):
     """
     Build and deploy a new application based on the provided specifications.
     
@@ -41,8 +75,7 @@ async def build_app(request: BuildRequest):
         logger.info(f"Starting build for task: {request.task}")
         
         # Use a stable, task-based repository name so round 2 can locate it
-        safe_task = re.sub(r"[^a-zA-Z0-9-_]", "-", request.task.strip()).lower()
-        repo_name = f"{safe_task}"
+        repo_name = _safe_task(request.task)
         
         # Generate app structure using LLM
         requirements = {
@@ -60,51 +93,34 @@ async def build_app(request: BuildRequest):
         
         # Create GitHub repository
         logger.info(f"Creating repository: {repo_name}")
-        repo = github_service.create_repository(
+        description = f"Generated app for task: {request.task}"
+        repo = await github.create_repository(
             name=repo_name,
-            description=f"Generated app for task: {request.task}",
+            description=description,
             private=False
         )
         
-        # Commit files to the repository
+        # Commit the seed README/LICENSE and the generated files together;
+        # generated files take precedence
         logger.info("Committing files...")
-        commit_sha = github_service.commit_files(
-            repo_name=repo.name,
-            files=app_files,
+        commit_sha = await github.commit_files(
+            repo_name=repo["name"],
+            files={**github.initial_files(repo, description), **app_files},
             commit_message="Initial commit: Generated app structure"
         )
         
         # Enable GitHub Pages
         logger.info("Enabling GitHub Pages...")
-        pages_url = github_service.enable_pages(repo_name=repo.name)
+        pages_url = await github.enable_pages(repo_name=repo["name"])
         
-        # Get repository URLs
-        repo_urls = github_service.get_repository_urls(repo_name=repo.name)
+        # Repository URLs derive from the repo object we already hold
+        repo_urls = github.urls_for(repo)
 
-        # Verify GitHub Pages availability with retries
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            ok = False
-            delay = 1
-            for _ in range(7):  # up to ~2 minutes total
-                try:
-                    resp = await client.get(pages_url, headers={"Cache-Control": "no-cache"})
-                    if resp.status_code == 200:
-                        ok = True
-                        break
-                    logger.info(f"Pages not ready ({resp.status_code}). Retrying in {delay}s...")
-                except Exception as e:
-                    logger.info(f"Pages check error: {e}. Retrying in {delay}s...")
-                await asyncio.sleep(delay)
-                delay = min(delay * 2, 30)
-            if not ok:
-                logger.warning("GitHub Pages did not return 200 within retry window")
-        
-        logger.info(f"Build completed successfully for {repo_name}")
-        
-        
-        # Notify evaluation endpoint (await with retries)
-        try:
-            await evaluation_client.notify(
+        # Verify GitHub Pages availability while notifying the evaluator; the
+        # notification only needs the repo URL and commit SHA, so the two overlap
+        _, notify_result = await asyncio.gather(
+            wait_for_pages(http, pages_url),
+            evaluation_client.notify(
                 url=request.evaluation_url,
                 payload={
                     "email": request.email,
@@ -115,9 +131,13 @@ async def build_app(request: BuildRequest):
                     "commit_sha": commit_sha,
                     "pages_url": pages_url,
                 },
-            )
-        except Exception as e:
-            logger.warning(f"Failed to notify evaluation URL: {e}")
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(notify_result, Exception):
+            logger.warning(f"Failed to notify evaluation URL: {notify_result}")
+        
+        logger.info(f"Build completed successfully for {repo_name}")
 
         return BuildResponse(
             status="success",
@@ -135,7 +155,11 @@ async def build_app(request: BuildRequest):
         )
 
 @router.post("/update", response_model=BuildResponse)
-async def update_app(request: BuildRequest):
+async def update_app(
+    request: BuildRequest,
+    http: httpx.AsyncClient = Depends(get_http_client),
+    github: GitHubService = Depends(get_github_service),
+):
     """
     Update an existing application based on new requirements.
     
@@ -158,23 +182,13 @@ async def update_app(request: BuildRequest):
         logger.info(f"Starting update for task: {request.task}, round: {request.round}")
         
         # Use the same stable, task-based repository name as in build phase
-        safe_task = re.sub(r"[^a-zA-Z0-9-_]", "-", request.task.strip()).lower()
-        repo_name = f"{safe_task}"
+        repo_name = _safe_task(request.task)
         
         # Get the existing repository
-        if settings.GITHUB_ORG:
-            repo = github_service.github.get_repo(f"{settings.GITHUB_ORG}/{repo_name}")
-        else:
-            repo = github_service.github.get_repo(f"{github_service.user.login}/{repo_name}")
+        repo = await github.get_repo(repo_name)
         
-        # Get the current files in the repository
-        contents = repo.get_contents("")
-        existing_files = {}
-        
-        # Process repository contents (this is a simplified version)
-        for content_file in contents:
-            if content_file.type == "file":
-                existing_files[content_file.path] = content_file.decoded_content.decode('utf-8')
+        # Get the current files in the repository (tree + tarball, no per-file requests)
+        existing_files = await github.get_repo_files(repo_name=repo_name)
         
         # Generate updated files using LLM
         requirements = {
@@ -190,36 +204,18 @@ async def update_app(request: BuildRequest):
         
         # Commit the updated files
         logger.info("Committing updates...")
-        commit_sha = github_service.commit_files(
+        commit_sha = await github.commit_files(
             repo_name=repo_name,
             files=updated_files,
             commit_message=f"Update: Round {request.round} - {request.brief[:50]}..."
         )
         
-        # Ensure GitHub Pages URL and verify availability
-        repo_urls = github_service.get_repository_urls(repo_name=repo_name)
-        pages_url = repo_urls.get("pages_url")
-        if pages_url:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                ok = False
-                delay = 1
-                for _ in range(7):
-                    try:
-                        resp = await client.get(pages_url, headers={"Cache-Control": "no-cache"})
-                        if resp.status_code == 200:
-                            ok = True
-                            break
-                        logger.info(f"Pages not ready after update ({resp.status_code}). Retrying in {delay}s...")
-                    except Exception as e:
-                        logger.info(f"Pages check error after update: {e}. Retrying in {delay}s...")
-                    await asyncio.sleep(delay)
-                    delay = min(delay * 2, 30)
-                if not ok:
-                    logger.warning("GitHub Pages did not return 200 within retry window after update")
-
-        # Notify evaluation endpoint
-        try:
-            await evaluation_client.notify(
+        # Verify GitHub Pages availability while notifying the evaluator
+        repo_urls = github.urls_for(repo)
+        pages_url = repo_urls["pages_url"]
+        _, notify_result = await asyncio.gather(
+            wait_for_pages(http, pages_url),
+            evaluation_client.notify(
                 url=request.evaluation_url,
                 payload={
                     "email": request.email,
@@ -228,11 +224,13 @@ async def update_app(request: BuildRequest):
                     "nonce": request.nonce,
                     "repo_url": repo_urls["html_url"],
                     "commit_sha": commit_sha,
-                    "pages_url": pages_url or repo_urls.get("pages_url"),
+                    "pages_url": pages_url,
                 },
-            )
-        except Exception as e:
-            logger.warning(f"Failed to notify evaluation URL after update: {e}")
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(notify_result, Exception):
+            logger.warning(f"Failed to notify evaluation URL after update: {notify_result}")
 
         logger.info(f"Update completed successfully for {repo_name}")
         
@@ -240,7 +238,7 @@ async def update_app(request: BuildRequest):
             status="success",
             message=f"Application updated successfully for round {request.round}",
             repo_url=repo_urls["html_url"],
-            pages_url=pages_url or repo_urls.get("pages_url"),
+            pages_url=pages_url,
             commit_sha=commit_sha
         )
         
@@ -1,37 +1,62 @@
+from functools import lru_cache
 from pydantic import Field
-from pydantic_settings import BaseSettings
-from typing import Optional
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import List, Optional
 
 class Settings(BaseSettings):
+    # Values come from the environment or the .env file, both read by
+    # pydantic-settings itself.
+
     # Application settings
     APP_NAME: str = "App Builder API"
-    DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
-    SECRET_KEY: str = Field(..., env="SECRET_KEY")
-    
+    DEBUG: bool = False
+    SECRET_KEY: str = Field(...)
+
     # GitHub settings
-    GITHUB_TOKEN: str = Field(..., env="GITHUB_TOKEN")
-    GITHUB_ORG: Optional[str] = os.getenv("GITHUB_ORG")
-    
+    GITHUB_TOKEN: str = Field(...)
+    # Optional comma-separated tokens to rotate between (overrides GITHUB_TOKEN)
+    GITHUB_TOKENS: Optional[str] = None
+    GITHUB_ORG: Optional[str] = None
+
     # LLM settings
-    OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
-    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4")
-    
+    OPENAI_API_KEY: Optional[str] = None
+    LLM_MODEL: str = "gpt-4"
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 86400
+
+    # Background task queue
+    TASK_QUEUE_WORKERS: int = 4
+
+    # Redis settings (optional shared cache tier)
+    REDIS_URL: Optional[str] = None
+
     # API settings
     API_PREFIX: str = "/api/v1"
-    HOST: str = os.getenv("HOST", "0.0.0.0")
-    PORT: int = int(os.getenv("PORT", "8000"))
-    
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    # Server worker processes (ignored in DEBUG, which reloads a single worker).
+    # Without REDIS_URL each process keeps its own task queue and rate-limit
+    # counters, so raise this only together with REDIS_URL.
+    WORKERS: int = 1
+
     # CORS settings
     CORS_ORIGINS: list = ["*"]
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
+
+    @property
+    def github_tokens(self) -> List[str]:
+        """GitHub tokens to rotate between, falling back to GITHUB_TOKEN."""
+        if self.GITHUB_TOKENS:
+            tokens = [token.strip() for token in self.GITHUB_TOKENS.split(",") if token.strip()]
+            if tokens:
+                return tokens
+        return [self.GITHUB_TOKEN]
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsed once."""
+    return Settings()
 
 # Initialize settings
-settings = Settings()
+settings = get_settings()
@@ -2,6 +2,14 @@ import logging
 from typing import Callable, Awaitable
 from fastapi import FastAPI
 
+from app.core.http import create_http_client
+from app.db import async_engine
+from app.services.evaluation_client import evaluation_client
+from app.services.evaluation_writer import evaluation_writer
+from app.services.gh_client import gh_client
+from app.services.llm_cache import llm_cache
+from app.services.llm_service import llm_service
+
 logger = logging.getLogger(__name__)
 
 async def startup(app: FastAPI) -> None:
@@ -14,9 +22,11 @@ async def startup(app: FastAPI) -> None:
     logger.info("Starting up application...")
     # Initialize any required services here
     try:
-        # Example: Initialize database connection
-        # await database.connect()
-        pass
+        # Shared HTTP connection pool for outbound requests
+        app.state.http = create_http_client()
+        evaluation_client.client = app.state.http
+        # Background batch writer for evaluation webhook results
+        await evaluation_writer.start()
     except Exception as e:
         logger.error(f"Error during startup: {e}")
         raise
@@ -31,9 +41,20 @@ async def shutdown(app: FastAPI) -> None:
     logger.info("Shutting down application...")
     # Clean up resources
     try:
-        # Example: Close database connection
-        # await database.disconnect()
-        pass
+        # Flush buffered evaluation results before closing the database
+        await evaluation_writer.stop()
+        # Close pooled async database connections
+        await async_engine.dispose()
+        # Close the shared HTTP connection pool
+        if getattr(app.state, "http", None) is not None:
+            evaluation_client.client = None
+            await app.state.http.aclose()
+        # Close the GitHub REST connection pool
+        await gh_client.aclose()
+        # Close the OpenAI connection pool
+        await llm_service.aclose()
+        # Close the LLM cache's Redis connection, if any
+        await llm_cache.close()
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
         raise
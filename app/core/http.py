@@ -0,0 +1,67 @@
+import httpx
+from fastapi import Request
+from httpx_retries import Retry, RetryTransport
+
+# Transient failures worth retrying on any outbound call. POST is included
+# because the evaluator notification is keyed by nonce and safe to repeat.
+_DEFAULT_RETRY = Retry(
+    total=6,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["HEAD", "GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    respect_retry_after_header=True,
+    backoff_jitter=0.5,
+    max_backoff_wait=60,
+)
+
+# Evaluator notifications are retried on any non-2xx answer, not only the
+# transient statuses above. Passed per request through the "retry" extension.
+NOTIFY_RETRY = _DEFAULT_RETRY.copy_with(status_forcelist=range(300, 600))
+
+# A newly published GitHub Pages site answers 404 until the deployment
+# finishes, so those hosts also retry on 404. Sleeps double from 1s up to the
+# 30s cap, waiting 90-120 seconds in total depending on jitter.
+_PAGES_RETRY = Retry(
+    total=8,
+    backoff_factor=0.5,
+    status_forcelist=[404, 429, 500, 502, 503, 504],
+    respect_retry_after_header=True,
+    backoff_jitter=0.5,
+    max_backoff_wait=30,
+)
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the long-lived HTTP client shared by outbound calls.
+    
+    Returns:
+        httpx.AsyncClient: A pooled client that keeps connections alive across
+        requests and retries transient failures with jittered backoff
+    """
+    return httpx.AsyncClient(
+        timeout=10.0,
+        transport=RetryTransport(
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=_LIMITS),
+            retry=_DEFAULT_RETRY,
+        ),
+        mounts={
+            "https://*.github.io": RetryTransport(
+                transport=httpx.AsyncHTTPTransport(http2=True, limits=_LIMITS),
+                retry=_PAGES_RETRY,
+            ),
+        },
+    )
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """
+    Dependency returning the shared HTTP client created at startup.
+    
+    Args:
+        request: The incoming request
+        
+    Returns:
+        httpx.AsyncClient: The application-wide client
+    """
+    return request.app.state.http
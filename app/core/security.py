@@ -1,3 +1,4 @@
+import hmac
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
@@ -6,17 +7,23 @@ from app.config import settings
 
 security = HTTPBearer()
 
+# Encoded once so each check only encodes the candidate secret
+_SECRET_BYTES = settings.SECRET_KEY.encode()
+
 def verify_secret(secret: str) -> bool:
     """
     Verify if the provided secret matches the expected secret.
     
+    The comparison runs in constant time so response timing does not reveal
+    how much of the secret matched.
+    
     Args:
         secret: The secret to verify
         
     Returns:
         bool: True if the secret is valid, False otherwise
     """
-    return secret == settings.SECRET_KEY
+    return hmac.compare_digest(secret.encode(), _SECRET_BYTES)
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """
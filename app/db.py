@@ -1,18 +1,48 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+import orjson
 
 from app.config import settings
 
 DATABASE_URL = getattr(settings, "DATABASE_URL", "sqlite:///./app.db")
 
+def _async_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (asyncpg / aiosqlite)."""
+    for prefix, async_prefix in (
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+def _json_serializer(value) -> str:
+    """Serialize JSON columns with orjson (SQLAlchemy expects a str)."""
+    return orjson.dumps(value).decode()
+
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    # Keep compiled SQL for the admin/webhook statements across requests
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for handlers that run on the event loop (e.g. the webhook)
+async_engine = create_async_engine(
+    _async_url(DATABASE_URL),
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 @contextmanager
 def get_db():
     db = SessionLocal()
@@ -20,3 +50,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+@asynccontextmanager
+async def get_async_db():
+    db: AsyncSession = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -9,9 +9,9 @@ class Submission(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, index=True, nullable=False)
-    task = Column(String, index=True, nullable=False)
+    task = Column(String, nullable=False)
     round = Column(Integer, nullable=False)
-    nonce = Column(String, index=True, nullable=False)
+    nonce = Column(String, nullable=False)
     repo_url = Column(String, nullable=False)
     pages_url = Column(String, nullable=False)
     commit_sha = Column(String, nullable=False)
@@ -19,6 +19,13 @@ class Submission(Base):
 
     evaluations = relationship("EvaluationResult", back_populates="submission", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Webhook lookup and conflict target for its upsert
+        Index("ix_submission_lookup", "email", "task", "round", "nonce", unique=True),
+        # Keyset pagination order used by the admin listing
+        Index("ix_submissions_created_at_id", created_at.desc(), id.desc()),
+    )
+
 class EvaluationResult(Base):
     __tablename__ = "evaluation_results"
 
@@ -31,3 +38,8 @@ class EvaluationResult(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     submission = relationship("Submission", back_populates="evaluations")
+
+    __table_args__ = (
+        # Keyset pagination order used by the admin listing
+        Index("ix_evaluation_results_created_at_id", created_at.desc(), id.desc()),
+    )
@@ -1,18 +1,103 @@
+import time
+from typing import Callable, Optional
+
+from limits.aio.strategies import STRATEGIES
+from limits.storage import storage_from_string
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 from fastapi import FastAPI
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
 
 # Shared limiter instance
-limiter = Limiter(key_func=get_remote_address, default_limits=["60/minute"])  # default global limit
+# Counters live in Redis when configured so they are shared by all workers
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=["60/minute"],  # default global limit
+    storage_uri=settings.REDIS_URL,
+)
+
+class ASGIRateLimiter:
+    """Pure ASGI middleware enforcing the limiter's default limits.
+
+    Unlike SlowAPIMiddleware (a BaseHTTPMiddleware) it does not wrap every
+    request in an extra task; it checks the limits itself and either forwards
+    the call or answers 429. Like SlowAPI, limits are counted per route
+    (path or endpoint name, following the limiter's key_style), unmatched
+    paths and exempt or decorator-limited routes are skipped, and key_prefix
+    is honoured. Counters live in the async variant of the limiter's storage
+    so a Redis backend does not block the event loop.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: Limiter):
+        self.app = app
+        self.limiter = limiter
+        self._key_func = limiter._key_func
+        # Default limits are static strings, so resolve them once
+        self._limits = [limit.limit for group in limiter._default_limits for limit in group]
+        uri = limiter._storage_uri or "memory://"
+        if not uri.startswith("async+"):
+            uri = f"async+{uri}"
+        options = dict(limiter._storage_options)
+        if uri.startswith("async+redis"):
+            # limits defaults to coredis for async Redis; use the redis
+            # package the app already depends on
+            options.setdefault("implementation", "redispy")
+        storage = storage_from_string(uri, **options)
+        self._strategy = STRATEGIES[limiter._strategy or "fixed-window"](storage)
+
+    @staticmethod
+    def _find_endpoint(scope: Scope) -> Optional[Callable]:
+        for route in getattr(scope.get("app"), "routes", []):
+            match, _ = route.matches(scope)
+            if match == Match.FULL and hasattr(route, "endpoint"):
+                return route.endpoint
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.limiter.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = self._find_endpoint(scope)
+        if endpoint is None:
+            await self.app(scope, receive, send)
+            return
+        name = f"{endpoint.__module__}.{endpoint.__name__}"
+        if name in self.limiter._exempt_routes or name in self.limiter._route_limits:
+            # Exempt, or limited by its own @limiter.limit decorator
+            await self.app(scope, receive, send)
+            return
+
+        limit_scope = scope["path"] if self.limiter._key_style == "url" else name
+        args = [self._key_func(Request(scope)), limit_scope]
+        if self.limiter._key_prefix:
+            args = [self.limiter._key_prefix] + args
+        for item in self._limits:
+            if not await self._strategy.hit(item, *args):
+                reset_time, _ = await self._strategy.get_window_stats(item, *args)
+                retry_after = max(0, int(reset_time - time.time()))
+                response = JSONResponse(
+                    {"error": f"Rate limit exceeded: {item}"},
+                    status_code=429,
+                    headers={"Retry-After": str(retry_after)},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
 
 # Helper to wire middleware and handler
 
 def setup_rate_limiting(app: FastAPI) -> None:
-    from slowapi.errors import RateLimitExceeded
     from slowapi import _rate_limit_exceeded_handler
 
     app.state.limiter = limiter
+    # Still needed for per-route @limiter.limit decorators
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-    app.add_middleware(SlowAPIMiddleware)
+    app.add_middleware(ASGIRateLimiter, limiter=limiter)
@@ -1,6 +1,10 @@
 from pydantic import BaseModel, HttpUrl, Field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
+
+def _utc_now() -> datetime:
+    """Timezone-aware UTC timestamp used for response/event defaults."""
+    return datetime.now(timezone.utc)
 
 class Attachment(BaseModel):
     """Represents a file attachment in a build request."""
@@ -31,7 +35,7 @@ class BuildResponse(BaseModel):
     pages_url: str = Field(..., description="URL of the deployed GitHub Pages site")
     commit_sha: Optional[str] = Field(None, description="SHA of the latest commit")
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=_utc_now,
         description="Timestamp of the response"
     )
 
@@ -55,7 +59,7 @@ class EvaluationResponse(BaseModel):
     )
     passed: bool = Field(..., description="Whether the evaluation passed")
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=_utc_now,
         description="Timestamp of the evaluation"
     )
 
@@ -73,14 +77,14 @@ class EvaluationWebhook(BaseModel):
     score: Optional[float] = Field(None, description="Numeric score (0-100)")
     feedback: Optional[Dict[str, Any]] = Field(None, description="Detailed feedback and results")
     passed: bool = Field(..., description="Whether the evaluation passed")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Timestamp of the evaluation")
+    timestamp: datetime = Field(default_factory=_utc_now, description="Timestamp of the evaluation")
 
 class HealthCheck(BaseModel):
     """Health check response model."""
     status: str = Field(..., description="Service status")
     version: str = Field(..., description="API version")
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=_utc_now,
         description="Current server time"
     )
     dependencies: Dict[str, str] = Field(
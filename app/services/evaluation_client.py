@@ -1,29 +1,33 @@
 import logging
 import httpx
-import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from app.core.http import NOTIFY_RETRY, create_http_client
 
 logger = logging.getLogger(__name__)
 
 class EvaluationClient:
-    def __init__(self, timeout: float = 10.0):
-        self.timeout = timeout
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # Shared client is attached at application startup
+        self.client = client
+
+    async def notify(self, url: str, payload: Dict[str, Any]) -> None:
+        if self.client is not None:
+            await self._notify(self.client, url, payload)
+            return
+        async with create_http_client() as client:
+            await self._notify(client, url, payload)
 
-    async def notify(self, url: str, payload: Dict[str, Any], max_retries: int = 6) -> None:
-        # Exponential backoff: 1, 2, 4, 8, 16, 32 seconds
-        delay = 1
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            for attempt in range(max_retries):
-                try:
-                    resp = await client.post(url, json=payload, headers={"Content-Type": "application/json"})
-                    if resp.status_code == 200:
-                        return
-                    logger.warning(f"Evaluation notify non-200 ({resp.status_code}): {resp.text}")
-                except Exception as e:
-                    logger.warning(f"Evaluation notify error: {e}")
-                await asyncio.sleep(delay)
-                delay = min(delay * 2, 60)
-        logger.error("Failed to notify evaluation URL after retries")
+    async def _notify(self, client: httpx.AsyncClient, url: str, payload: Dict[str, Any]) -> None:
+        # Retries with backoff, jitter and Retry-After are handled by the
+        # transport; NOTIFY_RETRY also retries 4xx answers
+        try:
+            resp = await client.post(url, json=payload, extensions={"retry": NOTIFY_RETRY})
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to notify evaluation URL: {e}")
+            return
+        if resp.status_code != 200:
+            logger.error(f"Evaluation notify non-200 ({resp.status_code}): {resp.text}")
 
 
 evaluation_client = EvaluationClient()
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_db
+from app.models import Submission, EvaluationResult
+
+logger = logging.getLogger(__name__)
+
+_SENTINEL: Dict[str, Any] = {"__stop__": True}
+
+# Errors meaning the database could not be reached, not that a row is bad
+_UNAVAILABLE_ERRORS = (OperationalError, OSError, asyncio.TimeoutError)
+
+def _upsert_insert(db: AsyncSession):
+    """Return the dialect-specific INSERT construct supporting ON CONFLICT."""
+    if db.bind.dialect.name == "postgresql":
+        return pg_insert
+    return sqlite_insert
+
+class EvaluationWriter:
+    """Persists evaluation webhook payloads in batches.
+
+    Payloads are buffered in memory and flushed every `max_delay` seconds or
+    `max_batch` rows, whichever comes first, in a single transaction: one
+    upsert per submission followed by one executemany INSERT of the results.
+    If a batch fails for any reason other than the database being
+    unreachable, its rows are retried one by one so a single bad row cannot
+    sink the rest.
+
+    Failed rows are re-queued after an exponential backoff (`retry_backoff`
+    * 2**n seconds, capped at `max_retry_delay`). Rows the database was
+    unreachable for are retried until it comes back, as long as no more than
+    `max_pending` rows are waiting; rows that fail on their own data are
+    dropped after `max_attempts` tries. Delivery is best-effort: rows still
+    buffered when the process stops or dies are lost.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = 100,
+        max_delay: float = 0.2,
+        max_attempts: int = 3,
+        retry_backoff: float = 1.0,
+        max_retry_delay: float = 60.0,
+        max_pending: int = 10000,
+    ):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self.max_pending = max_pending
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._worker_task: Optional[asyncio.Task] = None
+        # Entries waiting out their backoff, keyed by id(entry)
+        self._delayed: Dict[int, Tuple[asyncio.TimerHandle, Dict[str, Any]]] = {}
+
+    async def start(self):
+        # Idempotent start
+        if self._worker_task and not self._worker_task.done():
+            return
+        self._worker_task = asyncio.create_task(self._worker())
+
+    async def stop(self):
+        # Flush what is buffered, then stop the worker
+        if self._worker_task and not self._worker_task.done():
+            await self.queue.put(_SENTINEL)
+            try:
+                await self._worker_task
+            finally:
+                self._worker_task = None
+        # Give rows still waiting out a backoff one last attempt
+        pending = []
+        for handle, entry in self._delayed.values():
+            handle.cancel()
+            pending.append(entry)
+        self._delayed.clear()
+        while not self.queue.empty():
+            entry = self.queue.get_nowait()
+            if entry is not _SENTINEL:
+                pending.append(entry)
+        if pending:
+            unavailable, failed = await self._flush(pending)
+            for entry in unavailable + failed:
+                logger.error(f"Dropping evaluation at shutdown: {entry['payload']}")
+
+    async def enqueue(self, payload: Dict[str, Any]):
+        await self.queue.put({"payload": payload, "attempts": 0, "errors": 0})
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            entry = await self.queue.get()
+            if entry is _SENTINEL:
+                stopping = True
+                batch: List[Dict[str, Any]] = []
+            else:
+                batch = [entry]
+            # Drain until the batch is full or the flush deadline passes; when
+            # stopping, take whatever is left without waiting
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    if stopping:
+                        entry = self.queue.get_nowait()
+                    else:
+                        entry = await asyncio.wait_for(self.queue.get(), deadline - loop.time())
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if entry is _SENTINEL:
+                    stopping = True
+                    continue
+                batch.append(entry)
+            if not batch:
+                continue
+            try:
+                unavailable, failed = await self._flush(batch)
+            except Exception as e:
+                # Never let the worker die; the webhook keeps enqueueing
+                logger.error(f"Unexpected error persisting {len(batch)} evaluation(s): {e}")
+                unavailable, failed = [], batch
+            for entry in unavailable:
+                self._retry_later(entry)
+            for entry in failed:
+                self._retry_later(entry, bad_row=True)
+
+    def _retry_later(self, entry: Dict[str, Any], bad_row: bool = False):
+        entry["attempts"] += 1
+        if bad_row:
+            entry["errors"] += 1
+            if entry["errors"] >= self.max_attempts:
+                logger.error(f"Dropping evaluation after {entry['errors']} failed writes: {entry['payload']}")
+                return
+        if len(self._delayed) >= self.max_pending:
+            logger.error(f"Dropping evaluation, {len(self._delayed)} already waiting to be retried: {entry['payload']}")
+            return
+        delay = min(self.retry_backoff * 2 ** (entry["attempts"] - 1), self.max_retry_delay)
+        handle = asyncio.get_running_loop().call_later(delay, self._requeue, entry)
+        self._delayed[id(entry)] = (handle, entry)
+
+    def _requeue(self, entry: Dict[str, Any]):
+        self._delayed.pop(id(entry), None)
+        self.queue.put_nowait(entry)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Write a batch, isolating bad rows.
+
+        Returns:
+            The entries not written because the database was unreachable, and
+            the entries that failed on their own data
+        """
+        try:
+            await self._write(batch)
+            return [], []
+        except _UNAVAILABLE_ERRORS as e:
+            # Database unreachable: retrying rows one by one would only fail again
+            logger.error(f"DB unavailable persisting {len(batch)} evaluation(s): {e}")
+            return batch, []
+        except Exception as e:
+            logger.error(f"Error persisting {len(batch)} evaluation(s): {e}")
+            if len(batch) == 1:
+                return [], batch
+
+        unavailable, failed = [], []
+        for entry in batch:
+            try:
+                await self._write([entry])
+            except _UNAVAILABLE_ERRORS as e:
+                logger.error(f"DB unavailable persisting evaluation {entry['payload']}: {e}")
+                unavailable.append(entry)
+            except Exception as e:
+                logger.error(f"Error persisting evaluation {entry['payload']}: {e}")
+                failed.append(entry)
+        return unavailable, failed
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        async with get_async_db() as db:
+            results = []
+            for entry in batch:
+                payload = entry["payload"]
+                stmt = _upsert_insert(db)(Submission).values(
+                    email=payload["email"],
+                    task=payload["task"],
+                    round=payload["round"],
+                    nonce=payload["nonce"],
+                    repo_url=payload["repo_url"],
+                    pages_url=payload["pages_url"],
+                    commit_sha=payload["commit_sha"],
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["email", "task", "round", "nonce"],
+                    set_={
+                        "repo_url": stmt.excluded.repo_url,
+                        "pages_url": stmt.excluded.pages_url,
+                        "commit_sha": stmt.excluded.commit_sha,
+                    },
+                ).returning(Submission.id)
+                submission_id = (await db.execute(stmt)).scalar_one()
+                results.append({
+                    "submission_id": submission_id,
+                    "status": payload["status"],
+                    "score": payload["score"],
+                    "feedback": payload["feedback"],
+                    "passed": payload["passed"],
+                })
+
+            # One executemany INSERT and one commit for the whole batch
+            await db.execute(insert(EvaluationResult), results)
+            await db.commit()
+
+# Singleton instance
+evaluation_writer = EvaluationWriter()
@@ -0,0 +1,67 @@
+import asyncio
+import functools
+import logging
+from typing import Any, Awaitable, Callable, Hashable, Tuple
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class GhCache:
+    """TTL LRU cache for GitHub lookups that change on the order of minutes.
+
+    Entries are keyed by tuples such as ("repo", full_name) or
+    ("branch", full_name, branch). The lock only guards the cache itself;
+    fetches on a miss run outside it so concurrent misses do not serialize.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 600):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: Hashable) -> Any:
+        async with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        async with self._lock:
+            self._cache[key] = value
+
+    async def invalidate(self, key: Hashable) -> None:
+        async with self._lock:
+            self._cache.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+def cached_async(namespace: str, cache_attr: str = "cache"):
+    """Cache a coroutine method's result under (namespace, *args).
+
+    The instance's cache is looked up through `cache_attr`. Passing
+    `refresh=True` to the decorated method skips the lookup and stores the
+    fresh result.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @functools.wraps(func)
+        async def wrapper(self, *args: Any, refresh: bool = False) -> Any:
+            cache: GhCache = getattr(self, cache_attr)
+            key: Tuple[Hashable, ...] = (namespace, *args)
+            if not refresh:
+                value = await cache.get(key)
+                if value is not None:
+                    return value
+            value = await func(self, *args)
+            await cache.set(key, value)
+            return value
+        return wrapper
+    return decorator
+
+# Shared cache instance
+gh_cache = GhCache()
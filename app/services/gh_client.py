@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://api.github.com"
+
+# Longest we are willing to sleep for a single rate-limit window
+MAX_RATE_LIMIT_WAIT = 60.0
+
+# Transient server errors retried for idempotent methods
+_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+_SERVER_ERROR_BACKOFF = 0.5
+
+# Assumed quota for a token GitHub has not reported on yet
+_DEFAULT_QUOTA = 5000
+
+class GhError(httpx.HTTPStatusError):
+    """Base class for GitHub API error responses."""
+
+class GhRateLimited(GhError):
+    """Primary or secondary rate limit still hit after retrying."""
+
+class GhNotFound(GhError):
+    """The requested resource does not exist (or is not visible to the token)."""
+
+class GhServerError(GhError):
+    """GitHub answered with a 5xx status."""
+
+def raise_for_status(response: httpx.Response) -> None:
+    """Raise a typed GhError for error responses.
+
+    Args:
+        response: Response returned by GhClient
+
+    Raises:
+        GhRateLimited, GhNotFound, GhServerError, or GhError for other 4xx
+    """
+    if not response.is_error:
+        return
+    status = response.status_code
+    if _is_rate_limited(response):
+        exc_type = GhRateLimited
+    elif status == 404:
+        exc_type = GhNotFound
+    elif status >= 500:
+        exc_type = GhServerError
+    else:
+        exc_type = GhError
+    raise exc_type(
+        f"GitHub API {response.request.method} {response.request.url} returned {status}: {response.text}",
+        request=response.request,
+        response=response,
+    )
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    # Primary limits report remaining=0; secondary limits send retry-after
+    return response.status_code == 403 and (
+        response.headers.get("x-ratelimit-remaining") == "0" or "retry-after" in response.headers
+    )
+
+class GhClient:
+    """Async client for the GitHub REST API.
+
+    A single pooled HTTP/2 connection is shared by every GitHub call so
+    requests reuse TCP/TLS sessions instead of reconnecting per call.
+    Rate-limited responses (429, or 403 from a primary or secondary limit)
+    are retried up to `max_retries` times, honoring retry-after and
+    x-ratelimit-reset with jittered exponential backoff; when every token is
+    blocked for longer than MAX_RATE_LIMIT_WAIT, GhRateLimited is raised
+    without waiting. Transient 5xx
+    responses to idempotent methods are retried with the same budget, and
+    failed connection attempts are retried by the transport.
+
+    JSON GET responses are remembered with their ETag and revalidated with
+    If-None-Match; GitHub answers an unchanged resource with a 304 that does
+    not count against the primary rate limit, and the stored response is
+    returned instead.
+
+    With several tokens, each request uses the one with the most remaining
+    quota, so their rate limits add up; a rate-limited request is retried
+    straight away on another token when one still has quota.
+    """
+
+    def __init__(self, tokens: Sequence[str], max_retries: int = 5, etag_cache_size: int = 256):
+        if not tokens:
+            raise ValueError("At least one GitHub token is required")
+        self.max_retries = max_retries
+        self.etag_cache_size = etag_cache_size
+        self._tokens = list(tokens)
+        self._etags: "OrderedDict[Tuple[str, str], Tuple[str, httpx.Response]]" = OrderedDict()
+        # Last quota reported by GitHub per token as (remaining, reset epoch),
+        # used to pick a token and to pause before a doomed request
+        self._quota: Dict[str, Tuple[int, float]] = {}
+        self._client = httpx.AsyncClient(
+            base_url=API_URL,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            ),
+            headers={
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            timeout=15.0,
+            # Tarball downloads redirect to codeload.github.com
+            follow_redirects=True,
+        )
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying rate limits and transient server errors.
+
+        Returns the final response; callers decide whether an error status is
+        fatal via `raise_for_status`. A response still rate-limited or failing
+        after `max_retries` retries raises GhRateLimited or GhServerError.
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        etag_key = None
+        cached = None
+        if method == "GET":
+            etag_key = (url, repr(sorted((kwargs.get("params") or {}).items())))
+            cached = self._etags.get(etag_key)
+            if cached is not None:
+                headers["If-None-Match"] = cached[0]
+
+        for attempt in range(self.max_retries + 1):
+            token = self._pick_token()
+            if attempt == 0:
+                # Later attempts already slept off the delay below
+                await self._wait_for_quota(token)
+            response = await self._client.request(
+                method, url, headers={**headers, "Authorization": f"Bearer {token}"}, **kwargs
+            )
+            self._record_quota(token, response)
+            rate_limited = _is_rate_limited(response)
+            transient = response.status_code in _RETRY_STATUSES and method in _IDEMPOTENT_METHODS
+            if not (rate_limited or transient):
+                if etag_key is not None:
+                    return self._revalidated(etag_key, cached, response)
+                return response
+            if attempt == self.max_retries:
+                break
+            if rate_limited:
+                delay = self._retry_delay(response, attempt)
+                # Record when the token is really usable again; only the sleep
+                # is capped, not the reset
+                self._quota[token] = (0, self._blocked_until(response, delay))
+                if self._remaining_for(self._pick_token()) > 0:
+                    # Another token still has quota; switch to it right away
+                    delay = 0.0
+                elif self._next_reset() - time.time() > MAX_RATE_LIMIT_WAIT:
+                    # Every token is blocked for longer than we are willing
+                    # to wait; fail now instead of sleeping through retries
+                    break
+            else:
+                delay = _SERVER_ERROR_BACKOFF * 2 ** attempt + random.uniform(0, 0.25)
+            logger.warning(
+                f"GitHub {'rate limited' if rate_limited else 'server error on'} {method} {url} "
+                f"({response.status_code}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+        raise_for_status(response)
+        return response
+
+    def _revalidated(self, key: Tuple[str, str], cached: Optional[Tuple[str, httpx.Response]], response: httpx.Response) -> httpx.Response:
+        if response.status_code == 304 and cached is not None:
+            self._etags.move_to_end(key)
+            return cached[1]
+        etag = response.headers.get("etag")
+        # Only small JSON documents are kept; tarballs and raw content are not
+        if response.status_code == 200 and etag and response.headers.get("content-type", "").startswith("application/json"):
+            self._etags[key] = (etag, response)
+            self._etags.move_to_end(key)
+            while len(self._etags) > self.etag_cache_size:
+                self._etags.popitem(last=False)
+        return response
+
+    def _remaining_for(self, token: str) -> int:
+        remaining, reset_at = self._quota.get(token, (_DEFAULT_QUOTA, 0.0))
+        if remaining == 0 and reset_at <= time.time():
+            return _DEFAULT_QUOTA
+        return remaining
+
+    def _pick_token(self) -> str:
+        if len(self._tokens) == 1:
+            return self._tokens[0]
+        return max(self._tokens, key=self._remaining_for)
+
+    def _next_reset(self) -> float:
+        return min(self._quota.get(token, (0, 0.0))[1] for token in self._tokens)
+
+    async def _wait_for_quota(self, token: str) -> None:
+        # Pause until the window resets instead of spending a request on a 403;
+        # only reached when every token is exhausted. A reset further away than
+        # MAX_RATE_LIMIT_WAIT is not waited for: the request is sent, comes
+        # back rate limited and raises GhRateLimited straight away.
+        if self._remaining_for(token) == 0:
+            wait = self._quota[token][1] - time.time()
+            if wait <= MAX_RATE_LIMIT_WAIT:
+                logger.warning(f"GitHub quota exhausted, pausing {wait:.0f}s until reset")
+                await asyncio.sleep(wait)
+                self._quota.pop(token, None)
+
+    def _record_quota(self, token: str, response: httpx.Response) -> None:
+        remaining = response.headers.get("x-ratelimit-remaining")
+        reset = response.headers.get("x-ratelimit-reset")
+        if remaining is not None and reset is not None:
+            self._quota[token] = (int(remaining), float(reset))
+
+    @staticmethod
+    def _blocked_until(response: httpx.Response, delay: float) -> float:
+        """Epoch at which a rate-limited token can be used again."""
+        headers = response.headers
+        if headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+            # Primary limit: exhausted until the window resets
+            return float(headers["x-ratelimit-reset"])
+        if "retry-after" in headers:
+            return time.time() + float(headers["retry-after"])
+        return time.time() + delay
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("retry-after")
+        if retry_after is not None:
+            delay = float(retry_after)
+        elif response.headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in response.headers:
+            delay = float(response.headers["x-ratelimit-reset"]) - time.time()
+        else:
+            delay = 2 ** attempt
+        return min(max(delay, 0.0), MAX_RATE_LIMIT_WAIT) + random.uniform(0, 0.25)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+# Shared client instance
+gh_client = GhClient(settings.github_tokens)
@@ -1,175 +1,348 @@
-import os
+import io
 import base64
-from github import Github, GithubException
-from github.ContentFile import ContentFile
-from pathlib import Path
-from typing import Dict, List, Optional, Union
+import asyncio
+import tarfile
+from typing import Any, Dict, Optional, Tuple
 import logging
 from datetime import datetime
+from functools import lru_cache
 
 from app.config import settings
-from github import InputGitTreeElement
+from app.services.gh_cache import GhCache, cached_async, gh_cache
+from app.services.gh_client import GhClient, gh_client, raise_for_status
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# Files at least this large go through the Git Data API
+_CONTENTS_API_MAX_BYTES = 1024 * 1024
+
+# Extra attempts when the branch moves between reading its head and updating it
+_REF_CONFLICT_RETRIES = 2
+
+_MIT_TEMPLATE = """MIT License
+
+Copyright (c) {year} {owner}
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
 class GitHubService:
-    def __init__(self):
-        self.github = Github(settings.GITHUB_TOKEN)
-        self.user = self.github.get_user()
+    def __init__(self, client: GhClient = gh_client, cache: GhCache = gh_cache):
+        self.client = client
+        self.cache = cache
+        # "owner/" prefix for repository paths; resolved from /user on first
+        # use unless an organization is configured
+        self.owner: Optional[str] = settings.GITHUB_ORG
+        self.owner_prefix: Optional[str] = f"{self.owner}/" if self.owner else None
+    
+    async def ensure_ready(self) -> str:
+        """Resolve the repository owner once and cache it."""
+        if self.owner_prefix is None:
+            resp = await self.client.get("/user")
+            raise_for_status(resp)
+            self.owner = resp.json()["login"]
+            self.owner_prefix = f"{self.owner}/"
+        return self.owner
     
-    def create_repository(self, name: str, description: str = "", private: bool = False):
-        """Create a new GitHub repository."""
+    async def _full_name(self, repo_name: str) -> str:
+        """Return "owner/repo" for a repository owned by the org or the token's user."""
+        if self.owner_prefix is None:
+            await self.ensure_ready()
+        return self.owner_prefix + repo_name
+    
+    async def get_repo(self, repo_name: str, refresh: bool = False) -> Dict[str, Any]:
+        """Fetch repository metadata, served from the cache unless `refresh` is set."""
+        full_name = await self._full_name(repo_name)
+        return await self.get_repo_meta(full_name, refresh=refresh)
+    
+    @cached_async("repo")
+    async def get_repo_meta(self, full_name: str) -> Dict[str, Any]:
+        """Fetch metadata for "owner/repo"."""
+        resp = await self.client.get(f"/repos/{full_name}")
+        raise_for_status(resp)
+        return resp.json()
+    
+    @cached_async("branch")
+    async def get_branch_head(self, full_name: str, branch: str) -> Tuple[str, str]:
+        """Return the (commit SHA, tree SHA) the branch currently points at."""
+        resp = await self.client.get(f"/repos/{full_name}/branches/{branch}")
+        raise_for_status(resp)
+        commit = resp.json()["commit"]
+        return commit["sha"], commit["commit"]["tree"]["sha"]
+    
+    async def create_repository(self, name: str, description: str = "", private: bool = False) -> Dict[str, Any]:
+        """Create a new GitHub repository.
+
+        The repository is auto-initialized so the Git Data API can build on
+        its first commit; seed files from `initial_files` are meant to go into
+        the caller's first `commit_files` commit rather than separate commits.
+        """
+        payload = {"name": name, "description": description, "private": private, "auto_init": True}
         try:
             if settings.GITHUB_ORG:
-                org = self.github.get_organization(settings.GITHUB_ORG)
-                repo = org.create_repo(name, description=description, private=private)
+                resp = await self.client.post(f"/orgs/{settings.GITHUB_ORG}/repos", json=payload)
             else:
-                repo = self.user.create_repo(name, description=description, private=private)
+                resp = await self.client.post("/user/repos", json=payload)
             
-            # Initialize with a README
-            repo.create_file(
-                "README.md",
-                "Initial commit: Add README",
-                f"# {name}\n\n{description}"
-            )
-            # Add MIT LICENSE
-            mit_license = (
-                "MIT License\n\n"
-                "Copyright (c) "
-                f"{datetime.utcnow().year} {repo.owner.login}\n\n"
-                "Permission is hereby granted, free of charge, to any person obtaining a copy\n"
-                "of this software and associated documentation files (the \"Software\"), to deal\n"
-                "in the Software without restriction, including without limitation the rights\n"
-                "to use, copy, modify, merge, publish, distribute, sublicense, and/or sell\n"
-                "copies of the Software, and to permit persons to whom the Software is\n"
-                "furnished to do so, subject to the following conditions:\n\n"
-                "The above copyright notice and this permission notice shall be included in all\n"
-                "copies or substantial portions of the Software.\n\n"
-                "THE SOFTWARE IS PROVIDED \"AS IS\", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR\n"
-                "IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,\n"
-                "FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE\n"
-                "AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER\n"
-                "LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,\n"
-                "OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE\n"
-                "SOFTWARE.\n"
-            )
-            try:
-                repo.create_file("LICENSE", "Add MIT LICENSE", mit_license)
-            except GithubException:
-                pass
-            
-            return repo
-        except GithubException as e:
             # If repo already exists, fetch and return it (idempotent behavior)
-            msg = str(e).lower()
-            if getattr(e, "status", None) == 422 and "name already exists" in msg:
-                try:
-                    if settings.GITHUB_ORG:
-                        return self.github.get_repo(f"{settings.GITHUB_ORG}/{name}")
-                    else:
-                        return self.github.get_repo(f"{self.user.login}/{name}")
-                except Exception:
-                    pass
+            if resp.status_code == 422 and "name already exists" in resp.text.lower():
+                return await self.get_repo(name)
+            raise_for_status(resp)
+            return resp.json()
+        except httpx.HTTPError as e:
             logger.error(f"Failed to create repository: {e}")
             raise
     
-    def enable_pages(self, repo_name: str, branch: str = "main"):
+    @staticmethod
+    def initial_files(repo: Dict[str, Any], description: str = "") -> Dict[str, str]:
+        """README and MIT LICENSE that seed a new repository."""
+        owner = repo["owner"]["login"]
+        mit_license = _MIT_TEMPLATE.format(year=datetime.utcnow().year, owner=owner)
+        return {
+            "README.md": f"# {repo['name']}\n\n{description}",
+            "LICENSE": mit_license,
+        }
+    
+    async def enable_pages(self, repo_name: str, branch: str = "main") -> str:
         """Enable GitHub Pages for the repository by setting source to gh-pages via REST API.
         Creates gh-pages from the specified branch if missing.
         """
+        full_name = await self._full_name(repo_name)
         try:
-            if settings.GITHUB_ORG:
-                full_name = f"{settings.GITHUB_ORG}/{repo_name}"
-                repo = self.github.get_repo(full_name)
+            # Ensure gh-pages branch exists (pointing at current branch commit)
+            gh_pages = await self.client.get(f"/repos/{full_name}/branches/gh-pages")
+            if gh_pages.status_code == 404:
+                src_sha, _ = await self.get_branch_head(full_name, branch)
+                created = await self.client.post(
+                    f"/repos/{full_name}/git/refs",
+                    json={"ref": "refs/heads/gh-pages", "sha": src_sha},
+                )
+                raise_for_status(created)
             else:
-                full_name = f"{self.user.login}/{repo_name}"
-                repo = self.github.get_repo(full_name)
+                raise_for_status(gh_pages)
 
-            # Ensure gh-pages branch exists (pointing at current branch commit)
-            try:
-                repo.get_branch("gh-pages")
-            except GithubException:
-                src_branch = repo.get_branch(branch)
-                repo.create_git_ref(ref="refs/heads/gh-pages", sha=src_branch.commit.sha)
-
-            # Configure Pages source via GitHub REST API
-            api_url = f"https://api.github.com/repos/{full_name}/pages"
-            headers = {
-                "Accept": "application/vnd.github+json",
-                "Authorization": f"token {settings.GITHUB_TOKEN}",
-                "X-GitHub-Api-Version": "2022-11-28",
-            }
-            payload = {"source": {"branch": "gh-pages", "path": "/"}}
+            # Configure Pages source (PUT is idempotent)
             try:
-                with httpx.Client(timeout=15.0) as client:
-                    # PUT to set the source (idempotent)
-                    resp = client.put(api_url, headers=headers, json=payload)
-                    if resp.status_code not in (201, 204, 202):
-                        logger.info(f"Pages config PUT returned {resp.status_code}: {resp.text}")
-            except Exception as e:
+                resp = await self.client.put(
+                    f"/repos/{full_name}/pages",
+                    json={"source": {"branch": "gh-pages", "path": "/"}},
+                )
+                if resp.status_code not in (201, 204, 202):
+                    logger.info(f"Pages config PUT returned {resp.status_code}: {resp.text}")
+            except httpx.HTTPError as e:
                 logger.info(f"Pages configuration via REST failed: {e}")
 
-            return f"https://{repo.owner.login}.github.io/{repo.name}/"
-        except GithubException as e:
+            return f"https://{self.owner}.github.io/{repo_name}/"
+        except httpx.HTTPError as e:
             logger.error(f"Failed to enable GitHub Pages: {e}")
             raise
     
-    def commit_files(self, repo_name: str, files: Dict[str, str], commit_message: str, branch: str = "main"):
-        """Commit multiple files to the repository."""
+    async def commit_files(self, repo_name: str, files: Dict[str, str], commit_message: str, branch: str = "main") -> str:
+        """Commit multiple files to the repository in a single commit.
+
+        Uses the Git Data API directly: all blobs created concurrently (at most
+        8 in flight), one branch lookup (which carries both the head commit and
+        its tree), then one tree, one commit and one ref update. If the ref
+        update is rejected because the branch moved, the head is re-read and
+        the tree/commit rebuilt on top of it. Blobs are base64-encoded so
+        binary assets upload intact. A single small file is written with one
+        Contents API call instead.
+        """
+        full_name = await self._full_name(repo_name)
+        api = self.client
+
         try:
-            if settings.GITHUB_ORG:
-                repo = self.github.get_repo(f"{settings.GITHUB_ORG}/{repo_name}")
-            else:
-                repo = self.github.get_repo(f"{self.user.login}/{repo_name}")
-            
-            # Get the current commit to get the tree
-            branch_obj = repo.get_branch(branch)
-            base_tree = repo.get_git_tree(sha=branch_obj.commit.sha)
-            
-            # Create blobs and tree elements using InputGitTreeElement
-            tree_elements = []
-            for path, content in files.items():
-                if isinstance(content, str):
-                    text = content
-                else:
-                    text = content.decode('utf-8')
-                blob = repo.create_git_blob(text, 'utf-8')
-                element = InputGitTreeElement(path=path, mode="100644", type="blob", sha=blob.sha)
-                tree_elements.append(element)
-            
-            # Create a new tree
-            tree = repo.create_git_tree(tree_elements, base_tree)
-            
-            # Create a new commit
-            parent = repo.get_git_commit(sha=branch_obj.commit.sha)
-            commit = repo.create_git_commit(commit_message, tree, [parent])
-            
-            # Update the branch reference
-            branch_ref = repo.get_git_ref(f"heads/{branch}")
-            branch_ref.edit(sha=commit.sha)
-            
-            return commit.sha
-        except GithubException as e:
+            if len(files) == 1:
+                (path, content), = files.items()
+                data = content.encode("utf-8") if isinstance(content, str) else content
+                if len(data) < _CONTENTS_API_MAX_BYTES:
+                    return await self._put_file(full_name, path, data, commit_message, branch)
+
+            # Create all blobs concurrently, bounded to respect secondary rate limits
+            sem = asyncio.Semaphore(8)
+            tree_elements = await asyncio.gather(*(
+                self._create_blob(sem, full_name, path, content)
+                for path, content in files.items()
+            ))
+
+            for attempt in range(_REF_CONFLICT_RETRIES + 1):
+                # The branch object already carries the head commit and its
+                # tree; after a conflict it is re-read (ETag-revalidated)
+                head_sha, base_tree = await self.get_branch_head(full_name, branch, refresh=attempt > 0)
+
+                # Create a new tree on top of the current one
+                tree_resp = await api.post(
+                    f"/repos/{full_name}/git/trees",
+                    json={"base_tree": base_tree, "tree": tree_elements},
+                )
+                raise_for_status(tree_resp)
+
+                # Create a new commit
+                commit_resp = await api.post(
+                    f"/repos/{full_name}/git/commits",
+                    json={"message": commit_message, "tree": tree_resp.json()["sha"], "parents": [head_sha]},
+                )
+                raise_for_status(commit_resp)
+                commit_sha = commit_resp.json()["sha"]
+
+                # Update the branch reference; 409/422 means the head moved
+                # since it was read (not a fast-forward)
+                ref_update = await api.patch(
+                    f"/repos/{full_name}/git/refs/heads/{branch}",
+                    json={"sha": commit_sha},
+                )
+                if ref_update.status_code in (409, 422) and attempt < _REF_CONFLICT_RETRIES:
+                    logger.info(f"Branch {branch} of {full_name} moved during commit, retrying on the new head")
+                    continue
+                raise_for_status(ref_update)
+                break
+
+            return commit_sha
+        except httpx.HTTPError as e:
             logger.error(f"Failed to commit files: {e}")
             raise
+        finally:
+            # The branch has moved (or our cached head was stale)
+            await self.cache.invalidate(("branch", full_name, branch))
+    
+    async def _put_file(self, full_name: str, path: str, data: bytes, commit_message: str, branch: str) -> str:
+        """Create or update one file through the Contents API and return the commit SHA."""
+        payload = {
+            "message": commit_message,
+            "content": base64.b64encode(data).decode("ascii"),
+            "branch": branch,
+        }
+        existing = await self.client.get(f"/repos/{full_name}/contents/{path}", params={"ref": branch})
+        if existing.status_code == 200:
+            payload["sha"] = existing.json()["sha"]
+        elif existing.status_code != 404:
+            raise_for_status(existing)
+        resp = await self.client.put(f"/repos/{full_name}/contents/{path}", json=payload)
+        raise_for_status(resp)
+        return resp.json()["commit"]["sha"]
+    
+    async def _create_blob(self, sem: asyncio.Semaphore, full_name: str, path: str, content) -> Dict[str, str]:
+        """Upload one file as a base64 blob and return its tree entry."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        async with sem:
+            resp = await self.client.post(
+                f"/repos/{full_name}/git/blobs",
+                json={"content": base64.b64encode(data).decode("ascii"), "encoding": "base64"},
+            )
+        raise_for_status(resp)
+        return {"path": path, "mode": "100644", "type": "blob", "sha": resp.json()["sha"]}
     
-    def get_repository_urls(self, repo_name: str) -> Dict[str, str]:
+    async def get_repository_urls(self, repo_name: str) -> Dict[str, str]:
         """Get repository URLs."""
         try:
-            if settings.GITHUB_ORG:
-                repo = self.github.get_repo(f"{settings.GITHUB_ORG}/{repo_name}")
-            else:
-                repo = self.github.get_repo(f"{self.user.login}/{repo_name}")
-            
-            return {
-                "html_url": repo.html_url,
-                "clone_url": repo.clone_url,
-                "pages_url": f"https://{repo.owner.login}.github.io/{repo.name}/"
-            }
-        except GithubException as e:
+            return self.urls_for(await self.get_repo(repo_name))
+        except httpx.HTTPError as e:
             logger.error(f"Failed to get repository URLs: {e}")
             raise
+    
+    @staticmethod
+    def urls_for(repo: Dict[str, Any]) -> Dict[str, str]:
+        """Build repository URLs from already-fetched repository metadata."""
+        return {
+            "html_url": repo["html_url"],
+            "clone_url": repo["clone_url"],
+            "pages_url": f"https://{repo['owner']['login']}.github.io/{repo['name']}/"
+        }
+
+    async def get_repo_files(self, repo_name: str, ref: str = "main") -> Dict[str, str]:
+        """Fetch the text files of a repository at `ref` in two API requests.
+
+        The recursive tree lists every blob path while the tarball carries their
+        contents, so both are downloaded concurrently instead of issuing one
+        contents request per file. If the tarball is unavailable the blobs are
+        fetched concurrently instead. Files that are not valid UTF-8 are skipped.
+        """
+        full_name = await self._full_name(repo_name)
+        api = self.client
+        tree_resp, tarball_resp = await asyncio.gather(
+            api.get(f"/repos/{full_name}/git/trees/{ref}", params={"recursive": "1"}),
+            api.get(f"/repos/{full_name}/tarball/{ref}"),
+            return_exceptions=True,
+        )
+        if isinstance(tree_resp, Exception):
+            raise tree_resp
+        raise_for_status(tree_resp)
+
+        blob_urls = {
+            entry["path"]: entry["url"]
+            for entry in tree_resp.json().get("tree", [])
+            if entry.get("type") == "blob"
+        }
+
+        if isinstance(tarball_resp, httpx.Response) and tarball_resp.status_code == 200:
+            # Decompressing and walking the archive is CPU-bound; keep it off the event loop
+            return await asyncio.to_thread(self._extract_tarball, tarball_resp.content, blob_urls)
+
+        logger.info(f"Tarball unavailable for {full_name}, fetching blobs individually")
+        return await self._fetch_blobs(api, blob_urls)
+
+    @staticmethod
+    def _extract_tarball(content: bytes, paths) -> Dict[str, str]:
+        """Read the text files listed in `paths` out of a repository tarball."""
+        files: Dict[str, str] = {}
+        with tarfile.open(fileobj=io.BytesIO(content), mode="r:gz") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                # Members are prefixed with a "{owner}-{repo}-{sha}/" directory
+                path = member.name.split("/", 1)[-1]
+                if path not in paths:
+                    continue
+                data = tar.extractfile(member).read()
+                try:
+                    files[path] = data.decode("utf-8")
+                except UnicodeDecodeError:
+                    logger.info(f"Skipping non-text file: {path}")
+        return files
+
+    @staticmethod
+    async def _fetch_blobs(client: GhClient, blob_urls: Dict[str, str], concurrency: int = 10) -> Dict[str, str]:
+        """Download blobs concurrently, bounded to respect secondary rate limits."""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def fetch(url: str) -> httpx.Response:
+            async with sem:
+                return await client.get(url)
+
+        paths = list(blob_urls)
+        responses = await asyncio.gather(*(fetch(blob_urls[path]) for path in paths))
+
+        files: Dict[str, str] = {}
+        for path, resp in zip(paths, responses):
+            raise_for_status(resp)
+            try:
+                files[path] = base64.b64decode(resp.json()["content"]).decode("utf-8")
+            except UnicodeDecodeError:
+                logger.info(f"Skipping non-text file: {path}")
+        return files
+
+@lru_cache(maxsize=1)
+def get_github_service() -> GitHubService:
+    """FastAPI dependency returning the shared GitHubService.
 
-# Create a singleton instance
-github_service = GitHubService()
+    Nothing touches the network until the first request; tests can override
+    it through app.dependency_overrides.
+    """
+    return GitHubService()
@@ -0,0 +1,84 @@
+import time
+import zlib
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import orjson
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """Content-addressed cache for LLM outputs.
+    
+    An in-process LRU sits in front of an optional Redis tier so repeated
+    requirements are served without another model round trip. Values are
+    zlib-compressed in Redis; generated code compresses several-fold.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, ttl: int = 86400, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._redis = None
+        if redis_url:
+            import redis.asyncio as redis
+
+            self._redis = redis.Redis.from_url(redis_url)
+
+    @staticmethod
+    def make_key(namespace: str, data: Any) -> str:
+        """Hash the canonical JSON form of `data` into a cache key."""
+        canonical = orjson.dumps(data, option=orjson.OPT_SORT_KEYS, default=str)
+        return f"llm:{namespace}:{hashlib.sha256(canonical).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._local.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                return value
+            del self._local[key]
+
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            value = orjson.loads(zlib.decompress(raw))
+        except (zlib.error, orjson.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable LLM cache entry: {e}")
+            return None
+        self._set_local(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._set_local(key, value)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.setex(key, self.ttl, zlib.compress(orjson.dumps(value)))
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    def _set_local(self, key: str, value: Any) -> None:
+        self._local[key] = (time.monotonic() + self.ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+# Create a singleton instance
+llm_cache = LLMCache(redis_url=settings.REDIS_URL, ttl=settings.LLM_CACHE_TTL)
@@ -1,14 +1,38 @@
 import os
-import json
+import re
 import logging
 from typing import Dict, List, Optional, Any
+import httpx
 import openai
+import orjson
 from pathlib import Path
 
 from app.config import settings
+from app.services.llm_cache import llm_cache
 
 logger = logging.getLogger(__name__)
 
+# Fenced ```json block in an LLM reply
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\n(.*?)\n```", re.DOTALL)
+
+def _parse_json_reply(response: str) -> Any:
+    """Parse an LLM reply as JSON, trying the whole reply, then a fenced
+    block, then the outermost {...} slice for JSON surrounded by prose."""
+    candidates = [response]
+    json_match = _JSON_BLOCK_RE.search(response)
+    if json_match:
+        candidates.append(json_match.group(1))
+    start = response.find("{")
+    end = response.rfind("}")
+    if start != -1 and end > start:
+        candidates.append(response[start:end + 1])
+    for candidate in candidates:
+        try:
+            return orjson.loads(candidate)
+        except orjson.JSONDecodeError:
+            continue
+    raise ValueError("Failed to parse LLM response as JSON")
+
 class LLMService:
     def __init__(self):
         self.api_key = settings.OPENAI_API_KEY
@@ -16,15 +40,37 @@ class LLMService:
         # Only initialize the client if an API key is provided
         if self.api_key:
             try:
-                self.client = openai.OpenAI(api_key=self.api_key)
+                # One pooled HTTP/2 connection is reused across completions
+                self.client = openai.AsyncOpenAI(
+                    api_key=self.api_key,
+                    http_client=httpx.AsyncClient(
+                        http2=True,
+                        limits=httpx.Limits(max_keepalive_connections=10),
+                        timeout=httpx.Timeout(120.0, connect=10.0),
+                    ),
+                )
             except Exception as e:
                 logger.warning(f"Failed to initialize OpenAI client, will fallback: {e}")
                 self.client = None
         else:
             self.client = None
     
-    async def generate_code(self, prompt: str, context: Optional[Dict] = None) -> str:
-        """Generate code using the LLM based on the given prompt and context."""
+    async def generate_code(self, prompt: str, context: Optional[Dict] = None, refresh: bool = False, cache: bool = True) -> str:
+        """Generate code using the LLM based on the given prompt and context.
+
+        Completions are cached by model, prompt and context; `refresh` skips
+        the lookup and overwrites the cached entry. Callers that validate the
+        completion pass `cache=False` and cache only what they accept.
+        """
+        cache_key = None
+        if cache and settings.LLM_CACHE_ENABLED:
+            cache_key = llm_cache.make_key("code", {"model": self.model, "prompt": prompt, "context": context or {}})
+            if not refresh:
+                cached = await llm_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Using cached completion")
+                    return cached
+        
         try:
             if not self.client:
                 raise RuntimeError("OPENAI_API_KEY not set; LLM generation disabled")
@@ -41,53 +87,76 @@ class LLMService:
             if context:
                 messages.insert(1, {
                     "role": "system",
-                    "content": f"Additional context: {json.dumps(context, indent=2)}"
+                    "content": f"Additional context: {orjson.dumps(context, option=orjson.OPT_INDENT_2).decode()}"
                 })
             
-            response = await self.client.chat.completions.create(
+            # Stream tokens so the response is consumed as it is generated
+            # rather than buffered server-side until completion
+            stream = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=0.7,
-                max_tokens=2000
+                max_tokens=2000,
+                stream=True
             )
             
-            return response.choices[0].message.content
+            parts: List[str] = []
+            async for chunk in stream:
+                if chunk.choices:
+                    parts.append(chunk.choices[0].delta.content or "")
+            content = "".join(parts)
             
         except Exception as e:
             logger.error(f"Error generating code: {e}")
             raise
+        
+        if cache_key:
+            await llm_cache.set(cache_key, content)
+        return content
     
-    async def generate_app_structure(self, requirements: Dict) -> Dict[str, str]:
+    async def generate_app_structure(self, requirements: Dict, refresh: bool = False) -> Dict[str, str]:
         """Generate a complete app structure based on requirements."""
+        cache_key = None
+        if settings.LLM_CACHE_ENABLED:
+            # Requirements include existing files on updates, so they key those too
+            cache_key = llm_cache.make_key("structure", {"model": self.model, "requirements": requirements})
+            if not refresh:
+                cached = await llm_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Using cached app structure")
+                    return dict(cached)
+        
         try:
             prompt = f"""
             Based on the following requirements, generate a complete application structure.
             Return a JSON object where keys are file paths and values are the file contents.
             
             Requirements:
-            {json.dumps(requirements, indent=2)}
+            {orjson.dumps(requirements, option=orjson.OPT_INDENT_2).decode()}
             
             Include all necessary configuration files, source code, and documentation.
             """
             
-            response = await self.generate_code(prompt)
+            # Only the parsed structure is cached, so an unparseable reply is
+            # retried on the next call instead of being served from the cache
+            response = await self.generate_code(prompt, refresh=refresh, cache=False)
             
-            # Try to parse the response as JSON
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                # If the response isn't valid JSON, try to extract JSON from code blocks
-                import re
-                json_match = re.search(r'```(?:json)?\n(.*?)\n```', response, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group(1))
-                else:
-                    raise ValueError("Failed to parse LLM response as JSON")
+            app_files = _parse_json_reply(response)
                     
         except Exception as e:
             logger.error(f"Error generating app structure: {e}")
             # Fallback to a default structure
             return self._get_default_structure(requirements)
+        
+        # Only successful generations are cached, never the fallback template
+        if cache_key:
+            await llm_cache.set(cache_key, app_files)
+        return dict(app_files)
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        if self.client:
+            await self.client.close()
     
     def _get_default_structure(self, requirements: Dict) -> Dict[str, str]:
         """Generate a default app structure if LLM generation fails."""
@@ -0,0 +1,32 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Job = Dict[str, Any]
+JobFailure = Tuple[Job, Exception]
+
+# Batch handlers return the jobs that failed (or None when all succeeded);
+# raising means the whole batch failed
+BatchHandler = Callable[[List[Job]], Awaitable[Optional[List[JobFailure]]]]
+
+async def run_batch(handler: BatchHandler, batch: List[Job]) -> List[JobFailure]:
+    """Run a batch through the handler and return the individual job failures.
+
+    If the handler raises for a batch of several jobs, the jobs are retried
+    one at a time so a single bad job cannot fail the others.
+    """
+    try:
+        return list(await handler(batch) or [])
+    except Exception as e:
+        if len(batch) == 1:
+            return [(batch[0], e)]
+        logger.warning(f"Batch of {len(batch)} job(s) failed ({e}), retrying jobs one at a time")
+
+    failures: List[JobFailure] = []
+    for job in batch:
+        try:
+            failures.extend(await handler([job]) or [])
+        except Exception as e:
+            failures.append((job, e))
+    return failures
@@ -1,49 +1,99 @@
 import asyncio
 import logging
-from typing import Callable, Awaitable, Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.services.task_batch import BatchHandler, run_batch
 
 logger = logging.getLogger(__name__)
 
 _SENTINEL: Dict[str, Any] = {"__stop__": True}
 
+# Most jobs handed to the handler in one call
+MAX_BATCH = 16
+
+def _is_sentinel(job: Any) -> bool:
+    return job is _SENTINEL or (isinstance(job, dict) and job.get("__stop__"))
+
 class TaskQueue:
-    def __init__(self):
+    def __init__(self, max_batch: int = MAX_BATCH):
+        self.max_batch = max_batch
         self.queue: asyncio.Queue = asyncio.Queue()
-        self._worker_task: Optional[asyncio.Task] = None
-        self._handler: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._handler: Optional[BatchHandler] = None
+
+    async def start(self, handler: BatchHandler, num_workers: Optional[int] = None):
+        """Start a pool of workers consuming the queue concurrently.
 
-    async def start(self, handler: Callable[[Dict[str, Any]], Awaitable[None]]):
+        Each worker waits for one job, then drains whatever else is already
+        queued (up to `max_batch` jobs) and hands the handler the whole list,
+        so it can coalesce jobs, e.g. one commit per destination repository.
+        Failures are reported and logged per job.
+
+        Args:
+            handler: Coroutine called with a non-empty list of jobs, returning
+                the (job, error) pairs that failed
+            num_workers: Pool size, defaults to settings.TASK_QUEUE_WORKERS
+        """
         # Idempotent start
-        if self._worker_task and not self._worker_task.done():
+        if any(not task.done() for task in self._worker_tasks):
             return
         self._handler = handler
+        num_workers = num_workers or settings.TASK_QUEUE_WORKERS
 
-        async def _worker():
+        async def _worker(worker_id: int):
             while True:
                 job = await self.queue.get()
+                if _is_sentinel(job):
+                    self.queue.task_done()
+                    return
+                batch = [job]
+                # Each worker consumes exactly one sentinel, so one drained here
+                # ends this worker after the batch instead of being skipped
+                stopping = False
+                while len(batch) < self.max_batch:
+                    try:
+                        extra = self.queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if _is_sentinel(extra):
+                        self.queue.task_done()
+                        stopping = True
+                        break
+                    batch.append(extra)
                 try:
-                    if job is _SENTINEL or (isinstance(job, dict) and job.get("__stop__")):
-                        return
                     if self._handler:
-                        await self._handler(job)
+                        for job, error in await run_batch(self._handler, batch):
+                            logger.error(f"TaskQueue worker {worker_id} job failed: {error} ({job})")
                 except Exception as e:
-                    logger.error(f"TaskQueue handler error: {e}")
+                    logger.error(f"TaskQueue worker {worker_id} handler error on {len(batch)} job(s): {e}")
                 finally:
-                    self.queue.task_done()
+                    for _ in batch:
+                        self.queue.task_done()
+                if stopping:
+                    return
 
-        self._worker_task = asyncio.create_task(_worker())
+        self._worker_tasks = [asyncio.create_task(_worker(i)) for i in range(num_workers)]
 
     async def stop(self):
-        # Gracefully stop worker by unblocking queue.get()
-        if self._worker_task and not self._worker_task.done():
-            await self.queue.put(_SENTINEL)
+        # Gracefully stop workers by unblocking queue.get(), one sentinel each
+        running = [task for task in self._worker_tasks if not task.done()]
+        if running:
+            for _ in running:
+                await self.queue.put(_SENTINEL)
             try:
-                await self._worker_task
+                await asyncio.gather(*running)
             finally:
-                self._worker_task = None
+                self._worker_tasks = []
 
     async def enqueue(self, payload: Dict[str, Any]):
         await self.queue.put(payload)
 
-# Singleton instance
-queue = TaskQueue()
+# Singleton instance; Redis-backed (durable, shared across processes) when
+# REDIS_URL is configured, in-memory otherwise
+if settings.REDIS_URL:
+    from app.services.task_queue_redis import RedisTaskQueue
+
+    queue = RedisTaskQueue(settings.REDIS_URL, max_batch=MAX_BATCH)
+else:
+    queue = TaskQueue()
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, List, Optional
+
+import orjson
+import redis.asyncio as redis
+
+from app.config import settings
+from app.services.task_batch import BatchHandler, Job, run_batch
+
+logger = logging.getLogger(__name__)
+
+class RedisTaskQueue:
+    """Durable TaskQueue backed by a Redis list.
+
+    Exposes the same enqueue/start/stop API as the in-memory TaskQueue, but
+    jobs survive restarts and any number of processes or hosts can consume
+    the same list. Like TaskQueue, the handler receives batches of up to
+    `max_batch` jobs.
+
+    Workers move jobs with BLMOVE/LMOVE into their own processing list and
+    only remove them once the handler has finished, so a crash mid-batch
+    does not lose them: each consumer keeps a heartbeat key alive, and the
+    processing lists of consumers whose heartbeat expired are pushed back
+    onto the queue. Jobs that fail (a raising batch is retried one job at a
+    time first) or cannot be decoded are pushed individually to a
+    dead-letter list with their error attached. Requires Redis 6.2+ for
+    LMOVE/BLMOVE.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        key: str = "tdsq",
+        block_timeout: int = 5,
+        max_batch: int = 16,
+        heartbeat_ttl: int = 30,
+    ):
+        self.key = key
+        self.max_batch = max_batch
+        self.dead_letter_key = f"{key}:dead"
+        # Bounds how long stop() waits for an idle worker to notice
+        self.block_timeout = block_timeout
+        self.heartbeat_ttl = heartbeat_ttl
+        self._consumer_id = uuid.uuid4().hex
+        self._redis = redis.Redis.from_url(redis_url)
+        self._worker_tasks: List[asyncio.Task] = []
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._handler: Optional[BatchHandler] = None
+        self._stopping = False
+
+    async def start(self, handler: BatchHandler, num_workers: Optional[int] = None):
+        """Start a pool of workers consuming the Redis list.
+
+        Args:
+            handler: Coroutine called with a non-empty list of jobs, returning
+                the (job, error) pairs that failed
+            num_workers: Pool size, defaults to settings.TASK_QUEUE_WORKERS
+        """
+        # Idempotent start
+        if any(not task.done() for task in self._worker_tasks):
+            return
+        self._handler = handler
+        self._stopping = False
+        num_workers = num_workers or settings.TASK_QUEUE_WORKERS
+
+        await self._beat()
+        await self._recover_orphans()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+        async def _worker(worker_id: int):
+            processing_key = self._processing_key(worker_id)
+            # Jobs left over from a failed iteration go back to the queue first
+            restore = True
+            while not self._stopping:
+                try:
+                    if restore:
+                        await self._restore(processing_key)
+                        restore = False
+                    raw = await self._redis.blmove(self.key, processing_key, self.block_timeout, "LEFT", "RIGHT")
+                    if raw is None:
+                        continue
+                    raws = [raw]
+                    # Take whatever else is already queued in one round trip
+                    if self.max_batch > 1:
+                        async with self._redis.pipeline(transaction=False) as pipe:
+                            for _ in range(self.max_batch - 1):
+                                pipe.lmove(self.key, processing_key, "LEFT", "RIGHT")
+                            raws.extend(r for r in await pipe.execute() if r is not None)
+                    await self._process(worker_id, processing_key, raws)
+                except Exception as e:
+                    logger.error(f"RedisTaskQueue worker {worker_id} error: {e}")
+                    restore = True
+                    await asyncio.sleep(1)
+
+        self._worker_tasks = [asyncio.create_task(_worker(i)) for i in range(num_workers)]
+
+    async def stop(self):
+        # Workers finish their current batch and exit after the next BLMOVE timeout
+        self._stopping = True
+        running = [task for task in self._worker_tasks if not task.done()]
+        try:
+            if running:
+                await asyncio.gather(*running)
+        finally:
+            self._worker_tasks = []
+            if self._heartbeat_task is not None:
+                self._heartbeat_task.cancel()
+                self._heartbeat_task = None
+            try:
+                await self._redis.delete(self._heartbeat_key(self._consumer_id))
+            finally:
+                await self._redis.aclose()
+
+    async def enqueue(self, payload: Dict[str, Any]):
+        await self._redis.rpush(self.key, orjson.dumps(payload))
+
+    async def _process(self, worker_id: int, processing_key: str, raws: List[bytes]):
+        batch: List[Job] = []
+        dead: List[bytes] = []
+        for raw in raws:
+            try:
+                batch.append(orjson.loads(raw))
+            except orjson.JSONDecodeError as e:
+                logger.error(f"RedisTaskQueue worker {worker_id} cannot decode job: {e}")
+                dead.append(orjson.dumps({"raw": raw.decode("utf-8", "replace"), "error": str(e)}))
+        if batch and self._handler:
+            for job, error in await run_batch(self._handler, batch):
+                logger.error(f"RedisTaskQueue worker {worker_id} job failed: {error}")
+                dead.append(orjson.dumps({"job": job, "error": str(error)}, default=str))
+        # Dead-letter failures and release the batch in one transaction
+        async with self._redis.pipeline(transaction=True) as pipe:
+            if dead:
+                pipe.rpush(self.dead_letter_key, *dead)
+            pipe.delete(processing_key)
+            await pipe.execute()
+
+    async def _restore(self, processing_key: str):
+        # Push unfinished jobs back to the head of the queue, oldest first
+        while await self._redis.lmove(processing_key, self.key, "RIGHT", "LEFT") is not None:
+            pass
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_ttl / 3)
+            try:
+                await self._beat()
+                await self._recover_orphans()
+            except Exception as e:
+                logger.error(f"RedisTaskQueue heartbeat error: {e}")
+
+    async def _beat(self):
+        await self._redis.set(self._heartbeat_key(self._consumer_id), 1, ex=self.heartbeat_ttl)
+
+    async def _recover_orphans(self):
+        # Requeue the processing lists of consumers that stopped heartbeating
+        prefix = f"{self.key}:processing:"
+        async for raw_key in self._redis.scan_iter(match=f"{prefix}*"):
+            processing_key = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
+            consumer_id = processing_key[len(prefix):].split(":", 1)[0]
+            if not await self._redis.exists(self._heartbeat_key(consumer_id)):
+                logger.warning(f"Requeueing jobs left by stopped consumer {consumer_id}")
+                await self._restore(processing_key)
+
+    def _processing_key(self, worker_id: int) -> str:
+        return f"{self.key}:processing:{self._consumer_id}:{worker_id}"
+
+    def _heartbeat_key(self, consumer_id: str) -> str:
+        return f"{self.key}:consumer:{consumer_id}"
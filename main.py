@@ -1,12 +1,15 @@
 import os
 import logging
+import orjson
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
 
 from app.api import router as api_router
 from app.config import settings
 from app.core.events import create_start_app_handler, create_stop_app_handler
+from app.rate_limit import limiter, setup_rate_limiting
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +33,7 @@ def get_application() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url=f"{settings.API_PREFIX}/openapi.json",
+        default_response_class=ORJSONResponse,
     )
 
     # Set up CORS
@@ -53,15 +57,24 @@ def get_application() -> FastAPI:
             "health_check": "/health"
         }
 
-    # Health check endpoint
+    # Health check endpoint; the payload never changes, so it is serialized
+    # once. A fresh Response is still built per call because middleware such
+    # as CORS mutates response headers in place.
+    health_body = orjson.dumps({
+        "status": "ok",
+        "version": app.version,
+        "environment": "development" if settings.DEBUG else "production"
+    })
+
+    # Exempt from rate limiting so platform health probes are never throttled
     @app.get("/health")
+    @limiter.exempt
     async def health_check():
         """Health check endpoint."""
-        return {
-            "status": "ok",
-            "version": app.version,
-            "environment": "development" if settings.DEBUG else "production"
-        }
+        return Response(content=health_body, media_type="application/json")
+
+    # Per-client rate limiting, counted in Redis when REDIS_URL is set
+    setup_rate_limiting(app)
 
     # Add startup and shutdown event handlers
     app.add_event_handler("startup", create_start_app_handler(app))
@@ -77,10 +90,21 @@ app = get_application()
 
 if __name__ == "__main__":
     import uvicorn
+    workers = 1 if settings.DEBUG else settings.WORKERS
+    if workers > 1 and not settings.REDIS_URL:
+        # Each process gets its own task queue, rate-limit storage and caches
+        logger.warning(
+            f"Running {workers} workers without REDIS_URL: the task queue, rate limiter "
+            f"(effective limit is {workers}x the configured one) and the GitHub/LLM caches "
+            f"are per process"
+        )
     uvicorn.run(
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         reload=settings.DEBUG,
         log_level="info" if settings.DEBUG else "warning"
     )